@@ -0,0 +1,186 @@
+"""准入控制：按路由的自适应并发上限、优先级分级与 MySQL 语句超时（中文注释版）。
+
+- 每个路由维护独立的并发上限，按观测延迟做 AIMD 调整：延迟达标时加性增长，超标或语句超时时乘性下降；
+- 优先级 critical（健康检查、认证）不受路由上限约束；read / bulk 只能占用全局并发的一部分，
+  过载时批量请求最先被拒绝，保证健康检查与登录始终可用；
+- 被拒绝的请求立即返回 503 与 Retry-After，不在进程内排队；等待连接池超时（pool_timeout）同样视为过载；
+- 路由的 timeout_ms 通过连接签出事件写入 MySQL 会话变量 max_execution_time，超时查询同样返回 503。
+并发计数为进程内状态，需配合多线程 worker（gunicorn -k gthread）使用。
+"""
+
+import math
+import threading
+import time
+from functools import wraps
+
+from flask import g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+
+from models import db
+
+# MySQL 错误码：查询超过 max_execution_time 被中断
+MYSQL_QUERY_TIMEOUT = 3024
+
+
+class RouteLimiter:
+    """单个路由的 AIMD 并发上限。"""
+
+    def __init__(self, limit, min_limit, max_limit, target_ms, backoff):
+        self.limit = float(limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_ms = target_ms
+        self.backoff = backoff
+        self.in_flight = 0
+        self.ewma_ms = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight >= max(int(self.limit), 1):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency_ms: float, overloaded: bool = False) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.ewma_ms = latency_ms if not self.ewma_ms else 0.8 * self.ewma_ms + 0.2 * latency_ms
+            now = time.monotonic()
+            if overloaded or latency_ms > self.target_ms:
+                # 同一目标延迟窗口内只下降一次，避免一批慢请求把上限压到底
+                if now - self._last_decrease >= self.target_ms / 1000.0:
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self._last_decrease = now
+            else:
+                # 每完成约 limit 个达标请求，上限增加 1
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+
+class AdmissionController:
+    """为 flask-restful 资源提供准入判定的装饰器，配置见 Config.ADMISSION_*。
+
+    503 响应经 api.make_response 生成，与正常响应一样按 Accept 头协商格式。
+    """
+
+    def __init__(self, config, api):
+        self.api = api
+        self.global_limit = config["ADMISSION_GLOBAL_LIMIT"]
+        self.shares = config["ADMISSION_PRIORITY_SHARES"]
+        self.defaults = config["ADMISSION_DEFAULTS"]
+        self.routes = config["ADMISSION_ROUTES"]
+        self.backoff = config["ADMISSION_BACKOFF"]
+        self.retry_after_max = config["ADMISSION_RETRY_AFTER_MAX"]
+        self.in_flight = 0
+        self.limiters = {}
+        self._lock = threading.Lock()
+
+    def policy(self, method: str, rule: str) -> dict:
+        """按 "METHOD /path"、"/path" 的顺序查找路由策略，并以默认值补全。"""
+
+        override = self.routes.get(f"{method} {rule}") or self.routes.get(rule) or {}
+        return {**self.defaults, **override}
+
+    def _limiter(self, key: str, policy: dict) -> RouteLimiter:
+        with self._lock:
+            limiter = self.limiters.get(key)
+            if limiter is None:
+                limiter = RouteLimiter(
+                    policy["limit"], policy["min_limit"], policy["max_limit"], policy["target_ms"], self.backoff
+                )
+                self.limiters[key] = limiter
+            return limiter
+
+    def _enter_global(self, priority: str) -> bool:
+        with self._lock:
+            if priority != "critical" and self.in_flight >= self.global_limit * self.shares[priority]:
+                return False
+            self.in_flight += 1
+            return True
+
+    def _leave_global(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _reject(self, limiter: RouteLimiter = None, message: str = "服务繁忙，请稍后重试"):
+        retry_after = 1
+        if limiter is not None and limiter.ewma_ms:
+            retry_after = min(self.retry_after_max, max(1, math.ceil(limiter.ewma_ms / 1000.0)))
+        return self.api.make_response({"message": message}, 503, {"Retry-After": str(retry_after)})
+
+    def _call(self, view, limiter, args, kwargs):
+        """执行视图，语句超时与连接池超时转为 503；返回 (响应, 是否过载)。"""
+
+        try:
+            return view(*args, **kwargs), False
+        except OperationalError as exc:
+            if not _is_query_timeout(exc):
+                raise
+            db.session.rollback()
+            return self._reject(limiter, "查询超时，请缩小查询范围或稍后重试"), True
+        except PoolTimeoutError:
+            # 数据库连接全部被占用，等待超过 pool_timeout
+            db.session.rollback()
+            return self._reject(limiter), True
+
+    def guard(self, view):
+        """flask-restful 的全局资源装饰器（Api(decorators=[...])）。"""
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            rule = request.url_rule.rule if request.url_rule else request.path
+            key = f"{request.method} {rule}"
+            policy = self.policy(request.method, rule)
+            priority = policy["priority"]
+            g.statement_timeout_ms = policy["timeout_ms"]
+
+            if not self._enter_global(priority):
+                return self._reject(self.limiters.get(key))
+            if priority == "critical":
+                # 不受路由上限约束，但超时同样返回 503 而不是 500
+                try:
+                    return self._call(view, None, args, kwargs)[0]
+                finally:
+                    self._leave_global()
+
+            limiter = self._limiter(key, policy)
+            if not limiter.try_acquire():
+                self._leave_global()
+                return self._reject(limiter)
+
+            start = time.perf_counter()
+            overloaded = False
+            try:
+                response, overloaded = self._call(view, limiter, args, kwargs)
+                return response
+            finally:
+                limiter.release((time.perf_counter() - start) * 1000.0, overloaded)
+                self._leave_global()
+
+        return wrapper
+
+
+def _is_query_timeout(exc: OperationalError) -> bool:
+    orig = getattr(exc, "orig", None)
+    return bool(orig is not None and orig.args and orig.args[0] == MYSQL_QUERY_TIMEOUT)
+
+
+def init_statement_timeout(app) -> None:
+    """连接签出时按当前路由设置 max_execution_time（毫秒，0 为不限制）；仅 MySQL 生效。"""
+
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != "mysql":
+        return
+
+    @event.listens_for(engine, "checkout")
+    def set_statement_timeout(dbapi_connection, _record, _proxy):
+        # 每次签出都显式设置，避免上一个请求的会话变量残留在连接池中
+        timeout_ms = g.get("statement_timeout_ms", 0) if has_app_context() else 0
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SET SESSION max_execution_time = %s", (int(timeout_ms or 0),))
+        finally:
+            cursor.close()
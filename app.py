@@ -5,21 +5,30 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_restful import Api
 
+from admission import AdmissionController, init_statement_timeout
 from auth import LoginResource, RegisterResource
 from config import Config
 from models import db
 from resources import (
     AlgorithmDetailResource,
     AlgorithmListResource,
+    BatchResource,
+    BenchmarkListResource,
+    BenchmarkParetoResource,
+    BenchmarkSummaryResource,
     HealthResource,
+    JobDetailResource,
+    JobListResource,
     LabDetailResource,
     LabListResource,
     ProblemListResource,
     StatsResource,
+    SuggestResource,
     ToolDetailResource,
     ToolListResource,
 )
 from schemas import ma
+from wire import init_compression, register_representations
 
 
 def register_routes(api: Api) -> None:
@@ -30,16 +39,31 @@ def register_routes(api: Api) -> None:
     api.add_resource(StatsResource, "/api/stats")
     api.add_resource(ProblemListResource, "/api/problems")
 
+    # 搜索框联想（内存索引）
+    api.add_resource(SuggestResource, "/api/suggest")
+
     # 算法接口（含搜索、详情与管理员增删改）
     api.add_resource(AlgorithmListResource, "/api/algorithms")
     api.add_resource(AlgorithmDetailResource, "/api/algorithms/<int:algorithm_id>")
 
+    # 批量获取算法/工具及其关联实体（规范化结构）
+    api.add_resource(BatchResource, "/api/batch")
+
     # 工具与实验室 CRUD
     api.add_resource(ToolListResource, "/api/tools")
     api.add_resource(ToolDetailResource, "/api/tools/<int:tool_id>")
     api.add_resource(LabListResource, "/api/labs")
     api.add_resource(LabDetailResource, "/api/labs/<int:lab_id>")
 
+    # 工具性能基准：批量写入与聚合查询
+    api.add_resource(BenchmarkListResource, "/api/benchmarks")
+    api.add_resource(BenchmarkSummaryResource, "/api/benchmarks/summary")
+    api.add_resource(BenchmarkParetoResource, "/api/benchmarks/pareto")
+
+    # 后台任务（管理员）：提交、状态、取消
+    api.add_resource(JobListResource, "/api/jobs")
+    api.add_resource(JobDetailResource, "/api/jobs/<int:job_id>")
+
     # 认证接口
     api.add_resource(RegisterResource, "/api/auth/register")
     api.add_resource(LoginResource, "/api/auth/login")
@@ -61,10 +85,22 @@ def create_app(config_class=Config) -> Flask:
     # 开启跨域，默认允许所有来源访问 /api/*；可在环境变量中配置 CORS_ORIGINS。
     CORS(app, resources={r"/api/*": {"origins": app.config.get("CORS_ORIGINS", "*")}})
 
-    # 注册 RESTful 接口
     api = Api(app)
+    register_representations(api)
+
+    # 准入控制：按路由限流与优先级分级，过载时快速返回 503；须在注册路由前加入装饰器
+    if app.config["ADMISSION_ENABLED"]:
+        admission = AdmissionController(app.config, api)
+        app.extensions["admission"] = admission
+        api.decorators.append(admission.guard)
+        init_statement_timeout(app)
+
+    # 注册 RESTful 接口
     register_routes(api)
 
+    # 按 Accept-Encoding 压缩响应，并缓存压缩结果
+    init_compression(app)
+
     @app.route("/")
     def index():
         """根路由返回服务基本信息。"""
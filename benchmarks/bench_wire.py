@@ -0,0 +1,52 @@
+"""响应格式基准：比较各序列化格式与压缩编码的传输字节数和服务端 CPU 时间（中文注释版）。
+
+使用 Flask test_client 直接调用应用，不经过网络；数据库按 DATABASE_URL 连接，需已导入种子数据。
+用法：python benchmarks/bench_wire.py [--path /api/tools] [--repeat 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from wire import CBOR_MIMETYPE, MSGPACK_MIMETYPE, available_encodings, cbor2  # noqa: E402
+
+
+def run(path: str, repeat: int) -> None:
+    app = create_app()
+    client = app.test_client()
+    cache = app.extensions["compressed_cache"]
+
+    mimetypes = ["application/json", MSGPACK_MIMETYPE] + ([CBOR_MIMETYPE] if cbor2 is not None else [])
+    encodings = ["identity"] + list(available_encodings(app.config))
+
+    print(f"{'format':<22}{'encoding':<10}{'bytes':>10}{'cold ms':>10}{'warm ms':>10}")
+    for mimetype in mimetypes:
+        for encoding in encodings:
+            headers = {"Accept": mimetype, "Accept-Encoding": encoding}
+
+            # 冷启动：清空压缩缓存，测量含压缩的单次耗时
+            cache.clear()
+            start = time.process_time()
+            resp = client.get(path, headers=headers)
+            cold = (time.process_time() - start) * 1000
+            size = len(resp.get_data())
+
+            # 热缓存：重复请求，压缩结果直接复用
+            start = time.process_time()
+            for _ in range(repeat):
+                client.get(path, headers=headers)
+            warm = (time.process_time() - start) * 1000 / repeat
+
+            print(f"{mimetype:<22}{encoding:<10}{size:>10}{cold:>10.2f}{warm:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--path", default="/api/tools")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    run(args.path, args.repeat)
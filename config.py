@@ -16,7 +16,8 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
     # pre_ping 避免连接池中的陈旧连接导致错误。
-    SQLALCHEMY_ENGINE_OPTIONS = {"pool_pre_ping": True}
+    # pool_timeout 限制等待空闲连接的时间，连接耗尽时尽快失败而不是无限排队。
+    SQLALCHEMY_ENGINE_OPTIONS = {"pool_pre_ping": True, "pool_timeout": 5}
 
     # 保持 JSON 输出字段顺序，与定义顺序一致便于前端调试。
     JSON_SORT_KEYS = False
@@ -25,3 +26,59 @@ class Config:
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-secret-change-me")
     # 允许前端跨域携带的头部自动处理（由 CORS 库完成，这里预留配置位）。
     CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*")
+
+    # 搜索联想：默认/最大返回条数；索引全量重建间隔（秒），用于多 worker 间收敛；
+    # 检查跨进程版本号（其他 worker 或任务调度进程修改了名称）的最小间隔（秒）。
+    SUGGEST_DEFAULT_LIMIT = 10
+    SUGGEST_MAX_LIMIT = 50
+    SUGGEST_REFRESH_SECONDS = int(os.getenv("SUGGEST_REFRESH_SECONDS", "300"))
+    SUGGEST_VERSION_CHECK_SECONDS = float(os.getenv("SUGGEST_VERSION_CHECK_SECONDS", "2"))
+
+    # 响应压缩：小于阈值（字节）的响应不压缩；压缩结果缓存条数；各编码压缩级别。
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "500"))
+    COMPRESS_CACHE_SIZE = int(os.getenv("COMPRESS_CACHE_SIZE", "256"))
+    COMPRESS_GZIP_LEVEL = 6
+    COMPRESS_BROTLI_LEVEL = 5
+    COMPRESS_ZSTD_LEVEL = 3
+
+    # 后台任务：调度进程的进程池大小、轮询间隔（秒）、重试退避基数（秒）与批处理条数。
+    JOBS_MAX_WORKERS = int(os.getenv("JOBS_MAX_WORKERS", "2"))
+    JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "1.0"))
+    JOBS_RETRY_BACKOFF_SECONDS = 5
+    JOBS_BATCH_SIZE = 200
+
+    # 工具基准记录：单次批量写入的最大条数。
+    BENCHMARK_MAX_BATCH = int(os.getenv("BENCHMARK_MAX_BATCH", "10000"))
+
+    # 准入控制：全局并发上限（建议与 gunicorn 线程数一致），各优先级可占用的全局份额。
+    ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1") == "1"
+    ADMISSION_GLOBAL_LIMIT = int(os.getenv("ADMISSION_GLOBAL_LIMIT", "8"))
+    ADMISSION_PRIORITY_SHARES = {"critical": 1.0, "read": 0.75, "bulk": 0.4}
+    # AIMD 乘性下降系数；Retry-After 上限（秒）。
+    ADMISSION_BACKOFF = 0.7
+    ADMISSION_RETRY_AFTER_MAX = 30
+    # 路由默认策略：初始/最小/最大并发、目标延迟（毫秒）、MySQL 语句超时（毫秒，0 为不限制）。
+    ADMISSION_DEFAULTS = {
+        "priority": "read",
+        "limit": 8,
+        "min_limit": 1,
+        "max_limit": 32,
+        "target_ms": 500,
+        "timeout_ms": 5000,
+    }
+    # 按 "METHOD /path" 或 "/path"（Flask 路由规则）覆盖默认策略。
+    ADMISSION_ROUTES = {
+        "/api/health": {"priority": "critical", "timeout_ms": 1000},
+        "/api/auth/login": {"priority": "critical", "timeout_ms": 2000},
+        "/api/auth/register": {"priority": "critical", "timeout_ms": 2000},
+        "/api/suggest": {"target_ms": 50, "timeout_ms": 1000},
+        "/api/algorithms": {"limit": 4, "target_ms": 800, "timeout_ms": 3000},
+        "/api/stats": {"limit": 2, "target_ms": 1000, "timeout_ms": 5000},
+        "/api/benchmarks/summary": {"limit": 4, "target_ms": 1000, "timeout_ms": 10000},
+        "/api/benchmarks/pareto": {"limit": 4, "target_ms": 1000, "timeout_ms": 10000},
+        "POST /api/benchmarks": {"priority": "bulk", "limit": 1, "max_limit": 2, "target_ms": 5000, "timeout_ms": 0},
+        "POST /api/jobs": {"priority": "bulk", "limit": 2, "max_limit": 4},
+    }
+
+    # 批量获取接口：每类实体单次最多请求的 id 数量。
+    BATCH_MAX_IDS = 200
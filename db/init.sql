@@ -97,6 +97,24 @@ CREATE TABLE IF NOT EXISTS tool_paper (
     ON UPDATE CASCADE ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Table: benchmark_run (tool performance records)
+CREATE TABLE IF NOT EXISTS benchmark_run (
+  id BIGINT AUTO_INCREMENT PRIMARY KEY,
+  tool_id BIGINT NOT NULL,
+  dataset VARCHAR(255) NOT NULL,
+  read_count BIGINT,
+  wall_time_seconds DOUBLE NOT NULL,
+  peak_memory_mb DOUBLE NOT NULL,
+  accuracy DOUBLE,
+  `precision` DOUBLE,
+  recall DOUBLE,
+  created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  CONSTRAINT fk_benchmark_tool FOREIGN KEY (tool_id) REFERENCES tool(id)
+    ON UPDATE CASCADE ON DELETE CASCADE,
+  INDEX idx_benchmark_dataset_tool (dataset, tool_id),
+  INDEX idx_benchmark_tool (tool_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- Table: user
 CREATE TABLE IF NOT EXISTS user (
   id BIGINT AUTO_INCREMENT PRIMARY KEY,
@@ -110,7 +128,36 @@ CREATE TABLE IF NOT EXISTS user (
   INDEX idx_user_role (role)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Table: job (background job queue)
+CREATE TABLE IF NOT EXISTS job (
+  id BIGINT AUTO_INCREMENT PRIMARY KEY,
+  job_type VARCHAR(64) NOT NULL,
+  status ENUM('queued','running','succeeded','failed','cancelled') NOT NULL DEFAULT 'queued',
+  params JSON,
+  result JSON,
+  error TEXT,
+  progress DOUBLE NOT NULL DEFAULT 0,
+  message VARCHAR(255),
+  attempts INT NOT NULL DEFAULT 0,
+  max_attempts INT NOT NULL DEFAULT 1,
+  cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+  created_by VARCHAR(150),
+  created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  run_after DATETIME,
+  started_at DATETIME,
+  finished_at DATETIME,
+  INDEX idx_job_status_run_after (status, run_after),
+  INDEX idx_job_type_status (job_type, status)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Table: cache_version (cross-process cache invalidation, e.g. the suggest index)
+CREATE TABLE IF NOT EXISTS cache_version (
+  name VARCHAR(64) PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- Clear existing data to ensure clean slate for the 9 specific problems
+TRUNCATE TABLE benchmark_run;
 TRUNCATE TABLE tool_paper;
 TRUNCATE TABLE algorithm_paper;
 TRUNCATE TABLE paper;
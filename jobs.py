@@ -0,0 +1,442 @@
+"""后台任务子系统：数据库任务队列 + 本地进程池调度（中文注释版）。
+
+- Web 进程只负责写入 job 表（提交/查询/取消），不执行耗时操作；
+- 调度进程（python jobs.py）轮询 job 表，按任务类型的并发上限认领任务并交给进程池执行；
+- 任务函数通过 JobContext.report 上报进度，在每次提交前调用 check_cancelled 感知取消请求；
+  失败后按退避时间重试，约束冲突等确定性错误不重试。
+生产环境可把 job 表替换为真正的消息代理，任务函数与接口无需改动。
+"""
+
+import logging
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from models import Algorithm, Job, Tool, db
+from tool_benchmarks import is_id
+
+logger = logging.getLogger(__name__)
+
+# 已注册的任务类型：名称 -> {"func", "concurrency", "max_attempts"}
+JOB_TYPES = {}
+
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    """任务在执行中被取消；args[0] 可携带取消前已提交部分的结果。"""
+
+
+class JobError(Exception):
+    """不可重试的业务错误，例如参数非法或目标不存在。"""
+
+
+def job_type(name: str, concurrency: int = 1, max_attempts: int = 1):
+    """注册任务类型；concurrency 为同类任务同时运行的上限。"""
+
+    def decorator(fn):
+        JOB_TYPES[name] = {"func": fn, "concurrency": concurrency, "max_attempts": max_attempts}
+        return fn
+
+    return decorator
+
+
+def _utcnow() -> datetime:
+    # 与 DATETIME 列保持一致，统一使用不带时区的 UTC 时间
+    return datetime.utcnow()
+
+
+class JobContext:
+    """传给任务函数的上下文：读取参数、上报进度、检查取消。"""
+
+    # 两次进度写库的最小间隔（秒），避免高频小事务
+    REPORT_INTERVAL = 0.5
+
+    def __init__(self, job: Job):
+        self.job_id = job.id
+        self.params = job.params or {}
+        self._last_report = 0.0
+
+    def report(self, done: int, total: int, message: str = None) -> None:
+        """上报进度（独立连接提交，不影响任务自身事务）；只写进度，不检查取消。"""
+
+        now = time.monotonic()
+        if done < total and now - self._last_report < self.REPORT_INTERVAL:
+            return
+        self._last_report = now
+
+        values = {"progress": (done / total) if total else 1.0}
+        if message is not None:
+            values["message"] = message[:255]
+        with db.engine.begin() as conn:
+            conn.execute(update(Job.__table__).where(Job.__table__.c.id == self.job_id).values(**values))
+
+    def check_cancelled(self, partial_result=None) -> None:
+        """在提交本批修改之前调用：若管理员已请求取消则抛出 JobCancelled。
+
+        partial_result 为此前已提交部分的结果，会随取消状态一并记录。
+        """
+
+        with db.engine.connect() as conn:
+            cancel = conn.execute(
+                select(Job.__table__.c.cancel_requested).where(Job.__table__.c.id == self.job_id)
+            ).scalar()
+        if cancel:
+            raise JobCancelled(partial_result)
+
+
+# ---------- Web 进程侧：提交与取消 ----------
+
+
+def submit_job(name: str, params: dict, created_by: str = None) -> Job:
+    """写入一条排队中的任务，由调度进程异步执行。"""
+
+    spec = JOB_TYPES[name]
+    job = Job(
+        job_type=name,
+        status="queued",
+        params=params,
+        progress=0.0,
+        attempts=0,
+        max_attempts=spec["max_attempts"],
+        cancel_requested=False,
+        created_by=created_by,
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def cancel_job(job: Job) -> bool:
+    """取消任务：排队中直接置为 cancelled，运行中标记取消请求；已结束返回 False。"""
+
+    if job.status in FINISHED_STATUSES:
+        return False
+    if job.status == "queued":
+        # 条件更新，避免与调度进程认领发生竞争
+        changed = Job.query.filter(Job.id == job.id, Job.status == "queued").update(
+            {"status": "cancelled", "cancel_requested": True, "finished_at": _utcnow()},
+            synchronize_session=False,
+        )
+        if not changed:
+            Job.query.filter(Job.id == job.id).update({"cancel_requested": True}, synchronize_session=False)
+    else:
+        job.cancel_requested = True
+    db.session.commit()
+    db.session.refresh(job)
+    return True
+
+
+# ---------- 调度进程侧：执行、失败记录与调度循环 ----------
+
+_worker_app = None
+
+
+def _init_worker() -> None:
+    """进程池子进程初始化：创建独立的应用实例与数据库连接池。"""
+
+    global _worker_app
+    from app import create_app
+
+    _worker_app = create_app()
+
+
+def _record_failure(job_id: int, error: str) -> str:
+    """记录失败；剩余重试次数时按指数退避重新排队。返回最终状态。"""
+
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return "failed"
+    if job.cancel_requested:
+        job.status = "cancelled"
+        job.finished_at = _utcnow()
+    elif job.attempts < job.max_attempts:
+        base = current_app.config["JOBS_RETRY_BACKOFF_SECONDS"]
+        job.status = "queued"
+        job.run_after = _utcnow() + timedelta(seconds=base * 2 ** (job.attempts - 1))
+        job.message = f"第 {job.attempts} 次执行失败，等待重试"
+    else:
+        job.status = "failed"
+        job.finished_at = _utcnow()
+    job.error = error
+    db.session.commit()
+    return job.status
+
+
+def execute_job(job_id: int) -> str:
+    """在子进程中执行任务并写回最终状态。"""
+
+    with _worker_app.app_context():
+        try:
+            job = db.session.get(Job, job_id)
+            spec = JOB_TYPES.get(job.job_type)
+            ctx = JobContext(job)
+            try:
+                if spec is None:
+                    raise JobError(f"未知任务类型：{job.job_type}")
+                if job.cancel_requested:
+                    raise JobCancelled()
+                result = spec["func"](ctx)
+            except JobCancelled as exc:
+                db.session.rollback()
+                job = db.session.get(Job, job_id)
+                job.status = "cancelled"
+                job.result = exc.args[0] if exc.args else None
+                job.finished_at = _utcnow()
+                db.session.commit()
+                return job.status
+            except JobError as exc:
+                db.session.rollback()
+                job = db.session.get(Job, job_id)
+                job.status = "failed"
+                job.error = str(exc)
+                job.finished_at = _utcnow()
+                db.session.commit()
+                return job.status
+            except Exception:
+                db.session.rollback()
+                return _record_failure(job_id, traceback.format_exc())
+
+            job = db.session.get(Job, job_id)
+            job.status = "succeeded"
+            job.progress = 1.0
+            job.result = result
+            job.error = None
+            job.finished_at = _utcnow()
+            db.session.commit()
+            return job.status
+        finally:
+            db.session.remove()
+
+
+class JobDispatcher:
+    """轮询 job 表并把任务分发到进程池，遵守全局与按类型的并发上限。"""
+
+    def __init__(self, app):
+        self.app = app
+        self.max_workers = app.config["JOBS_MAX_WORKERS"]
+        self.poll_interval = app.config["JOBS_POLL_INTERVAL"]
+        self.pool = None
+        # future -> (job_id, job_type)
+        self.running = {}
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+
+    def recover(self) -> None:
+        """启动时处理上次调度进程遗留的 running 任务：计为一次失败并按重试规则处理。"""
+
+        with self.app.app_context():
+            stale = [job_id for (job_id,) in db.session.query(Job.id).filter(Job.status == "running")]
+            for job_id in stale:
+                _record_failure(job_id, "调度进程重启，任务被中断")
+            db.session.remove()
+
+    def _reap(self) -> None:
+        """回收已结束的 future；子进程崩溃时在父进程记录失败并重建进程池。"""
+
+        broken = False
+        for future in [f for f in self.running if f.done()]:
+            job_id, _ = self.running.pop(future)
+            exc = future.exception()
+            if exc is None:
+                continue
+            broken = broken or isinstance(exc, BrokenProcessPool)
+            with self.app.app_context():
+                _record_failure(job_id, f"{type(exc).__name__}: {exc}")
+                db.session.remove()
+        if broken:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = self._new_pool()
+
+    def _claim(self, job_id: int) -> bool:
+        """原子认领：仅当任务仍为 queued 时置为 running。"""
+
+        changed = Job.query.filter(Job.id == job_id, Job.status == "queued").update(
+            {"status": "running", "started_at": _utcnow(), "attempts": Job.attempts + 1},
+            synchronize_session=False,
+        )
+        db.session.commit()
+        return changed == 1
+
+    def poll_once(self) -> int:
+        """执行一轮调度，返回本轮新启动的任务数。"""
+
+        self._reap()
+        capacity = self.max_workers - len(self.running)
+        if capacity <= 0:
+            return 0
+
+        started = 0
+        running_by_type = Counter(name for _, name in self.running.values())
+        with self.app.app_context():
+            now = _utcnow()
+            ready = Job.query.filter(Job.status == "queued", or_(Job.run_after.is_(None), Job.run_after <= now))
+
+            # 未注册的类型无法执行，直接标记失败，避免永久占据队列
+            for job in ready.filter(Job.job_type.notin_(list(JOB_TYPES))).all():
+                job.status = "failed"
+                job.error = f"未知任务类型：{job.job_type}"
+                job.finished_at = now
+            db.session.commit()
+
+            for name, spec in JOB_TYPES.items():
+                slots = min(spec["concurrency"] - running_by_type[name], capacity - started)
+                if slots <= 0:
+                    continue
+                ids = [
+                    job_id
+                    for (job_id,) in ready.filter(Job.job_type == name)
+                    .with_entities(Job.id)
+                    .order_by(Job.id.asc())
+                    .limit(slots)
+                ]
+                for job_id in ids:
+                    if not self._claim(job_id):
+                        continue
+                    future = self.pool.submit(execute_job, job_id)
+                    self.running[future] = (job_id, name)
+                    running_by_type[name] += 1
+                    started += 1
+            db.session.remove()
+        return started
+
+    def run_forever(self) -> None:
+        self.pool = self._new_pool()
+        self.recover()
+        logger.info("job dispatcher started: workers=%s types=%s", self.max_workers, ", ".join(JOB_TYPES))
+        try:
+            while True:
+                if not self.poll_once():
+                    time.sleep(self.poll_interval)
+        finally:
+            self.pool.shutdown(wait=True)
+
+
+# ---------- 任务类型 ----------
+
+TOOL_BULK_FIELDS = ("name", "version", "description", "website", "license", "algorithm_id", "lab_id")
+# 字符串字段的最大长度（None 表示 TEXT 不限长），与 tool 表列定义一致
+TOOL_TEXT_FIELDS = {"name": 255, "version": 50, "description": None, "website": 255, "license": 100}
+
+
+def _check_tool_update(item) -> str:
+    """校验单条工具修改，返回错误信息；合法时返回空字符串。"""
+
+    if not isinstance(item, dict) or not is_id(item.get("id")):
+        return "需为包含整数 id 的对象"
+    for field, max_length in TOOL_TEXT_FIELDS.items():
+        if field not in item:
+            continue
+        value = item[field]
+        if value is None and field != "name":
+            continue
+        if not isinstance(value, str) or (field == "name" and not value.strip()):
+            return f"{field} 需为{'非空' if field == 'name' else ''}字符串"
+        if max_length is not None and len(value) > max_length:
+            return f"{field} 长度不能超过 {max_length}"
+    if "algorithm_id" in item and not is_id(item["algorithm_id"]):
+        return "algorithm_id 需为整数"
+    if "lab_id" in item and item["lab_id"] is not None and not is_id(item["lab_id"]):
+        return "lab_id 需为整数或 null"
+    return ""
+
+
+@job_type("tool_bulk_update", concurrency=2, max_attempts=3)
+def tool_bulk_update(ctx: JobContext):
+    """批量修改工具字段，替代逐条调用 PUT /api/tools/<id>；按批提交，可重复执行。"""
+
+    updates = ctx.params.get("updates")
+    if not isinstance(updates, list):
+        raise JobError("params.updates 需为对象列表")
+    # 参数错误是确定性的，执行前整体校验，避免进入 SQL 后被当作临时故障重试
+    for i, item in enumerate(updates):
+        error = _check_tool_update(item)
+        if error:
+            raise JobError(f"params.updates[{i}]：{error}")
+
+    batch_size = current_app.config["JOBS_BATCH_SIZE"]
+    # 仅统计已提交批次，取消或失败时如实反映已生效的修改
+    result = {"updated": 0, "missing": [], "conflicts": []}
+    total = len(updates)
+    for start in range(0, total, batch_size):
+        batch = updates[start : start + batch_size]
+        updated, missing, conflicts = 0, [], []
+        try:
+            tools = {t.id: t for t in Tool.query.filter(Tool.id.in_([u["id"] for u in batch]))}
+            for item in batch:
+                tool = tools.get(item["id"])
+                if tool is None:
+                    missing.append(item["id"])
+                    continue
+                if "name" in item and item["name"] != tool.name:
+                    dup = Tool.query.filter(Tool.id != tool.id, Tool.name == item["name"]).first()
+                    if dup:
+                        conflicts.append(item["id"])
+                        continue
+                for field in TOOL_BULK_FIELDS:
+                    if field in item:
+                        setattr(tool, field, item[field])
+                updated += 1
+            ctx.check_cancelled(result)
+            db.session.commit()
+        except IntegrityError as exc:
+            # algorithm_id / lab_id 不存在等约束错误是确定性的，重试只会重复已提交的批次
+            db.session.rollback()
+            raise JobError(
+                f"第 {start + 1}~{start + len(batch)} 条违反数据约束（已提交 {result['updated']} 条）：{exc.orig}"
+            ) from exc
+        result["updated"] += updated
+        result["missing"] += missing
+        result["conflicts"] += conflicts
+        done = min(start + batch_size, total)
+        ctx.report(done, total, f"已处理 {done}/{total}")
+    return result
+
+
+@job_type("algorithm_cascade_delete", concurrency=1, max_attempts=3)
+def algorithm_cascade_delete(ctx: JobContext):
+    """删除算法及其下属工具与文献关联；算法已不存在时视为完成。"""
+
+    algorithm_id = ctx.params.get("algorithm_id")
+    if not is_id(algorithm_id):
+        raise JobError("params.algorithm_id 需为整数")
+
+    alg = db.session.get(Algorithm, algorithm_id)
+    if alg is None:
+        return {"deleted_algorithm": 0, "deleted_tools": 0}
+
+    tools = list(alg.tools)
+    total = len(tools) + 1
+    try:
+        for done, tool in enumerate(tools, start=1):
+            tool.papers = []
+            db.session.delete(tool)
+            ctx.report(done, total, f"删除工具 {tool.name}")
+        alg.papers = []
+        db.session.flush()
+        db.session.delete(alg)
+        # 整个删除在一个事务内，提交前最后确认未被取消
+        ctx.check_cancelled()
+        db.session.commit()
+    except IntegrityError as exc:
+        db.session.rollback()
+        raise JobError(f"删除违反数据约束：{exc.orig}") from exc
+    ctx.report(total, total, "删除完成")
+    return {"deleted_algorithm": 1, "deleted_tools": len(tools)}
+
+
+if __name__ == "__main__":
+    # 以模块名重新导入，保证调度进程与 Web 进程使用同一份任务注册表
+    import jobs
+    from app import create_app
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    jobs.JobDispatcher(create_app()).run_forever()
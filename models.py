@@ -162,6 +162,35 @@ class Paper(db.Model):
         return f"<Paper {self.id} {self.title}>"
 
 
+class BenchmarkRun(db.Model):
+    """工具性能基准记录：某工具在某数据集上的一次运行结果，只追加不修改。"""
+
+    __tablename__ = "benchmark_run"
+    __table_args__ = (
+        db.Index("idx_benchmark_dataset_tool", "dataset", "tool_id"),
+        db.Index("idx_benchmark_tool", "tool_id"),
+        {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    # 不建立反向关系，避免 ToolSchema 序列化时带出全部基准记录
+    tool_id = db.Column(
+        db.BigInteger, db.ForeignKey("tool.id", onupdate="CASCADE", ondelete="CASCADE"), nullable=False
+    )
+    dataset = db.Column(db.String(255), nullable=False)
+    read_count = db.Column(db.BigInteger)
+    wall_time_seconds = db.Column(db.Float, nullable=False)
+    peak_memory_mb = db.Column(db.Float, nullable=False)
+    # 准确性指标，取值 0~1，可缺省
+    accuracy = db.Column(db.Float)
+    precision = db.Column(db.Float)
+    recall = db.Column(db.Float)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=db.func.current_timestamp(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<BenchmarkRun {self.id} tool={self.tool_id} {self.dataset}>"
+
+
 class User(db.Model):
     """用户实体，支持角色区分，密码存储为哈希。"""
 
@@ -182,3 +211,53 @@ class User(db.Model):
 
     def __repr__(self) -> str:
         return f"<User {self.id} {self.username}>"
+
+
+class Job(db.Model):
+    """后台任务实体：以数据库表充当任务队列，记录状态、进度、重试与结果。"""
+
+    __tablename__ = "job"
+    __table_args__ = (
+        db.Index("idx_job_status_run_after", "status", "run_after"),
+        db.Index("idx_job_type_status", "job_type", "status"),
+        {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    job_type = db.Column(db.String(64), nullable=False)
+    status = db.Column(
+        db.Enum("queued", "running", "succeeded", "failed", "cancelled", name="job_status_enum"),
+        nullable=False,
+        default="queued",
+    )
+    params = db.Column(db.JSON)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    # 进度 0~1，message 为最近一次进度说明
+    progress = db.Column(db.Float, nullable=False, default=0.0)
+    message = db.Column(db.String(255))
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=1)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    created_by = db.Column(db.String(150))
+    created_at = db.Column(db.DateTime(timezone=True), server_default=db.func.current_timestamp(), nullable=False)
+    # 最早可执行时间，重试退避时推后
+    run_after = db.Column(db.DateTime(timezone=True))
+    started_at = db.Column(db.DateTime(timezone=True))
+    finished_at = db.Column(db.DateTime(timezone=True))
+
+    def __repr__(self) -> str:
+        return f"<Job {self.id} {self.job_type} {self.status}>"
+
+
+class CacheVersion(db.Model):
+    """跨进程缓存失效信号：写入方递增 version，各进程发现版本变化后重建本地缓存。"""
+
+    __tablename__ = "cache_version"
+    __table_args__ = {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"}
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<CacheVersion {self.name}={self.version}>"
@@ -2,13 +2,26 @@
 
 from functools import wraps
 
-from flask import request
+from flask import current_app, request
+from flask_jwt_extended import get_jwt
 from flask_restful import Resource
 from sqlalchemy import or_, text
+from sqlalchemy.orm import lazyload, selectinload
 
 from auth import admin_required
-from models import Algorithm, Lab, Problem, Tool, db
-from schemas import AlgorithmSchema, LabSchema, ProblemSchema, ToolSchema
+from jobs import JOB_TYPES, cancel_job, submit_job
+from models import Algorithm, BenchmarkRun, Job, Lab, Problem, Tool, db
+from schemas import (
+    AlgorithmSchema,
+    BenchmarkRunSchema,
+    JobSchema,
+    LabSchema,
+    PaperSchema,
+    ProblemSchema,
+    ToolSchema,
+)
+from suggest import SUGGEST_MODELS, ensure_fresh
+from tool_benchmarks import insert_runs, is_id, pareto_front, summarize, validate_runs
 
 # 预生成常用 Schema，减少重复实例化开销
 problem_schema = ProblemSchema(many=True)
@@ -18,6 +31,17 @@ tool_schema = ToolSchema(many=True)
 tool_detail_schema = ToolSchema()
 lab_schema = LabSchema(many=True)
 lab_detail_schema = LabSchema()
+job_schema = JobSchema(many=True)
+job_detail_schema = JobSchema()
+benchmark_schema = BenchmarkRunSchema(many=True)
+
+# 批量接口使用的平铺 Schema：关系改以 id 列表表示，关联实体单独去重返回
+batch_algorithm_schema = AlgorithmSchema(many=True, exclude=("problem", "tools", "papers"))
+batch_tool_schema = ToolSchema(many=True, exclude=("algorithm", "lab", "papers"))
+batch_paper_schema = PaperSchema(many=True, exclude=("algorithms", "tools"))
+batch_lab_schema = LabSchema(many=True, exclude=("tools",))
+batch_problem_schema = ProblemSchema(many=True, exclude=("algorithms",))
+BATCH_INCLUDES = {"tools", "papers", "labs", "problems"}
 
 
 class HealthResource(Resource):
@@ -55,6 +79,27 @@ class StatsResource(Resource):
         }
 
 
+class SuggestResource(Resource):
+    """搜索框联想：从内存索引返回 {type, id, name} 的前 k 条，不访问实体详情。"""
+
+    def get(self):
+        keyword = request.args.get("q") or ""
+        limit = request.args.get("limit", type=int) or current_app.config["SUGGEST_DEFAULT_LIMIT"]
+        limit = max(1, min(limit, current_app.config["SUGGEST_MAX_LIMIT"]))
+
+        types = None
+        if request.args.get("types"):
+            types = {t.strip() for t in request.args["types"].split(",") if t.strip()}
+            unknown = types - {entity_type for entity_type, _ in SUGGEST_MODELS}
+            if unknown:
+                return {"message": f"不支持的类型：{', '.join(sorted(unknown))}"}, 400
+
+        index = ensure_fresh(
+            current_app.config["SUGGEST_REFRESH_SECONDS"], current_app.config["SUGGEST_VERSION_CHECK_SECONDS"]
+        )
+        return index.search(keyword, limit=limit, types=types)
+
+
 class ProblemListResource(Resource):
     """问题列表接口，返回全部问题及关联算法摘要。"""
 
@@ -146,6 +191,96 @@ class AlgorithmDetailResource(Resource):
         return {"message": "删除成功"}
 
 
+class BatchResource(Resource):
+    """批量获取算法与工具：每类实体一次 IN 查询，文献/实验室/问题去重后以规范化结构返回。"""
+
+    def post(self):
+        data = request.get_json() or {}
+        if not isinstance(data, dict):
+            return {"message": "请求体需为 JSON 对象"}, 400
+        algorithm_ids = _id_list(data.get("algorithms"))
+        tool_ids = _id_list(data.get("tools"))
+        if algorithm_ids is None or tool_ids is None:
+            return {"message": "algorithms 与 tools 需为整数 id 列表"}, 400
+        include = data.get("include") or []
+        if not isinstance(include, list) or not all(isinstance(name, str) for name in include):
+            return {"message": "include 需为字符串列表"}, 400
+        include = set(include)
+        if not algorithm_ids and not tool_ids:
+            return {"message": "algorithms 与 tools 至少提供一个"}, 400
+        max_ids = current_app.config["BATCH_MAX_IDS"]
+        if len(algorithm_ids) > max_ids or len(tool_ids) > max_ids:
+            return {"message": f"每类最多请求 {max_ids} 个 id"}, 400
+        if include - BATCH_INCLUDES:
+            return {"message": f"include 仅支持：{', '.join(sorted(BATCH_INCLUDES))}"}, 400
+
+        papers = {}
+
+        algorithms = []
+        if algorithm_ids:
+            query = Algorithm.query.filter(Algorithm.id.in_(algorithm_ids))
+            if "papers" in include:
+                query = query.options(selectinload(Algorithm.papers))
+            algorithms = query.order_by(Algorithm.id.asc()).all()
+
+        # 工具：显式请求的 id 与所请求算法下的工具合并为一次查询；
+        # 只需 algorithm_id，不再连带 join 算法（及其问题）
+        tools = []
+        if tool_ids or ("tools" in include and algorithms):
+            condition = Tool.id.in_(tool_ids)
+            if "tools" in include and algorithms:
+                condition = or_(condition, Tool.algorithm_id.in_([alg.id for alg in algorithms]))
+            query = Tool.query.options(lazyload(Tool.algorithm)).filter(condition)
+            if "papers" in include:
+                query = query.options(selectinload(Tool.papers))
+            tools = query.order_by(Tool.id.asc()).all()
+
+        algorithm_rows = batch_algorithm_schema.dump(algorithms)
+        if "tools" in include:
+            tools_by_algorithm = {}
+            for tool in tools:
+                tools_by_algorithm.setdefault(tool.algorithm_id, []).append(tool.id)
+            for row in algorithm_rows:
+                row["tool_ids"] = tools_by_algorithm.get(row["id"], [])
+        if "papers" in include:
+            for row, alg in zip(algorithm_rows, algorithms):
+                row["paper_ids"] = sorted(p.id for p in alg.papers)
+                papers.update((p.id, p) for p in alg.papers)
+
+        tool_rows = batch_tool_schema.dump(tools)
+        if "papers" in include:
+            for row, tool in zip(tool_rows, tools):
+                row["paper_ids"] = sorted(p.id for p in tool.papers)
+                papers.update((p.id, p) for p in tool.papers)
+
+        payload = {"algorithms": algorithm_rows, "tools": tool_rows}
+        if "papers" in include:
+            payload["papers"] = batch_paper_schema.dump([papers[pid] for pid in sorted(papers)])
+        if "labs" in include:
+            labs = {tool.lab.id: tool.lab for tool in tools if tool.lab is not None}
+            payload["labs"] = batch_lab_schema.dump([labs[lid] for lid in sorted(labs)])
+        if "problems" in include:
+            problems = {alg.problem.id: alg.problem for alg in algorithms}
+            payload["problems"] = batch_problem_schema.dump([problems[pid] for pid in sorted(problems)])
+
+        found_tools = {tool.id for tool in tools}
+        payload["missing"] = {
+            "algorithms": sorted(set(algorithm_ids) - {alg.id for alg in algorithms}),
+            "tools": sorted(set(tool_ids) - found_tools),
+        }
+        return payload
+
+
+def _id_list(value):
+    """校验并去重 id 列表；缺省视为空列表，格式非法返回 None。"""
+
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(is_id(v) for v in value):
+        return None
+    return list(dict.fromkeys(value))
+
+
 class ToolListResource(Resource):
     """工具列表/新增；GET 开放，POST 需管理员。"""
 
@@ -218,6 +353,89 @@ class ToolDetailResource(Resource):
         return {"message": "删除成功"}
 
 
+class BenchmarkListResource(Resource):
+    """工具基准记录列表/批量写入；GET 开放，POST 需管理员，一次可写入数千条。"""
+
+    method_decorators = {"post": [admin_required]}
+
+    def get(self):
+        query = BenchmarkRun.query
+        tool_id = request.args.get("tool_id", type=int)
+        if tool_id:
+            query = query.filter(BenchmarkRun.tool_id == tool_id)
+        dataset = request.args.get("dataset")
+        if dataset:
+            query = query.filter(BenchmarkRun.dataset == dataset)
+        limit = request.args.get("limit", 100, type=int)
+        offset = request.args.get("offset", 0, type=int)
+        runs = query.order_by(BenchmarkRun.id.asc()).offset(max(offset, 0)).limit(max(1, min(limit, 1000))).all()
+        return benchmark_schema.dump(runs)
+
+    def post(self):
+        data = request.get_json() or {}
+        runs = data.get("runs") if isinstance(data, dict) else data
+        if not isinstance(runs, list) or not runs:
+            return {"message": "请提交非空的 runs 列表"}, 400
+        max_batch = current_app.config["BENCHMARK_MAX_BATCH"]
+        if len(runs) > max_batch:
+            return {"message": f"单次最多写入 {max_batch} 条"}, 413
+
+        # 只用合法的整数 id 查询，其余交给 validate_runs 按下标报告
+        requested = {run["tool_id"] for run in runs if isinstance(run, dict) and is_id(run.get("tool_id"))}
+        known = {tid for (tid,) in db.session.query(Tool.id).filter(Tool.id.in_(requested))} if requested else set()
+        errors = validate_runs(runs, known)
+        if errors:
+            return {"message": "记录校验失败", "errors": [{"index": i, "message": m} for i, m in errors[:50]]}, 400
+
+        return {"inserted": insert_runs(runs)}, 201
+
+
+class BenchmarkSummaryResource(Resource):
+    """数据集上每个工具的运行次数与指标中位数，可按问题筛选工具。"""
+
+    def get(self):
+        dataset = request.args.get("dataset")
+        if not dataset:
+            return {"message": "dataset 为必填"}, 400
+        tool_ids = _problem_tool_ids(request.args.get("problem_id", type=int))
+        rows = summarize(dataset, tool_ids)
+        names = _tool_names(row["tool_id"] for row in rows)
+        for row in rows:
+            row["tool_name"] = names.get(row["tool_id"])
+        return {"dataset": dataset, "tools": rows}
+
+
+class BenchmarkParetoResource(Resource):
+    """问题 P 下各工具在数据集上的准确率-内存 Pareto 前沿。"""
+
+    def get(self):
+        dataset = request.args.get("dataset")
+        problem_id = request.args.get("problem_id", type=int)
+        if not dataset or not problem_id:
+            return {"message": "dataset 与 problem_id 为必填"}, 400
+        front = pareto_front(dataset, _problem_tool_ids(problem_id))
+        names = _tool_names(point["tool_id"] for point in front)
+        for point in front:
+            point["tool_name"] = names.get(point["tool_id"])
+        return {"dataset": dataset, "problem_id": problem_id, "front": front}
+
+
+def _problem_tool_ids(problem_id):
+    """问题下所有算法对应的工具 id；未指定问题时返回 None 表示不过滤。"""
+
+    if not problem_id:
+        return None
+    rows = db.session.query(Tool.id).join(Algorithm, Tool.algorithm_id == Algorithm.id)
+    return {tid for (tid,) in rows.filter(Algorithm.problem_id == problem_id)}
+
+
+def _tool_names(tool_ids) -> dict:
+    ids = list(tool_ids)
+    if not ids:
+        return {}
+    return dict(db.session.query(Tool.id, Tool.name).filter(Tool.id.in_(ids)))
+
+
 class LabListResource(Resource):
     """实验室列表/新增；GET 开放，POST 需管理员。"""
 
@@ -284,3 +502,53 @@ class LabDetailResource(Resource):
         db.session.delete(lab)
         db.session.commit()
         return {"message": "删除成功"}
+
+
+class JobListResource(Resource):
+    """后台任务列表/提交；仅管理员。提交后立即返回 202，由调度进程异步执行。"""
+
+    method_decorators = [admin_required]
+
+    def get(self):
+        query = Job.query
+        status = request.args.get("status")
+        if status:
+            query = query.filter(Job.status == status)
+        job_type = request.args.get("type")
+        if job_type:
+            query = query.filter(Job.job_type == job_type)
+        limit = request.args.get("limit", 50, type=int)
+        jobs = query.order_by(Job.id.desc()).limit(max(1, min(limit, 200))).all()
+        return job_schema.dump(jobs)
+
+    def post(self):
+        data = request.get_json() or {}
+        job_type = data.get("type")
+        if job_type not in JOB_TYPES:
+            return {"message": f"type 需为以下之一：{', '.join(JOB_TYPES)}"}, 400
+        params = data.get("params") or {}
+        if not isinstance(params, dict):
+            return {"message": "params 需为对象"}, 400
+
+        job = submit_job(job_type, params, created_by=get_jwt().get("username"))
+        return job_detail_schema.dump(job), 202
+
+
+class JobDetailResource(Resource):
+    """后台任务状态查询与取消；仅管理员。"""
+
+    method_decorators = [admin_required]
+
+    def get(self, job_id: int):
+        job = db.session.get(Job, job_id)
+        if not job:
+            return {"message": "未找到该任务"}, 404
+        return job_detail_schema.dump(job)
+
+    def delete(self, job_id: int):
+        job = db.session.get(Job, job_id)
+        if not job:
+            return {"message": "未找到该任务"}, 404
+        if not cancel_job(job):
+            return {"message": "任务已结束，无法取消"}, 409
+        return job_detail_schema.dump(job), 202
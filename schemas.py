@@ -3,7 +3,7 @@
 from flask_marshmallow import Marshmallow
 from marshmallow import EXCLUDE, fields
 
-from models import Algorithm, Lab, Paper, Problem, Tool, User, db
+from models import Algorithm, BenchmarkRun, Job, Lab, Paper, Problem, Tool, User, db
 
 # 全局单例，供应用初始化
 ma = Marshmallow()
@@ -90,6 +90,18 @@ class PaperSchema(ma.SQLAlchemyAutoSchema):
     tools = ma.Nested("ToolSchema", many=True, only=("id", "name", "version"))
 
 
+class BenchmarkRunSchema(ma.SQLAlchemyAutoSchema):
+    """工具基准记录序列化，仅输出平铺字段。"""
+
+    class Meta:
+        model = BenchmarkRun
+        include_fk = True
+        load_instance = True
+        sqla_session = db.session
+        ordered = True
+        unknown = EXCLUDE
+
+
 class UserSchema(ma.SQLAlchemyAutoSchema):
     """用户实体序列化，密码哈希仅用于入库，不回传给前端。"""
 
@@ -104,3 +116,16 @@ class UserSchema(ma.SQLAlchemyAutoSchema):
 
     # load_only 确保响应中不返回密码哈希，避免信息泄露
     password_hash = fields.String(load_only=True)
+
+
+class JobSchema(ma.SQLAlchemyAutoSchema):
+    """后台任务序列化，供管理员查看状态、进度与结果。"""
+
+    class Meta:
+        model = Job
+        include_fk = True
+        include_relationships = True
+        load_instance = True
+        sqla_session = db.session
+        ordered = True
+        unknown = EXCLUDE
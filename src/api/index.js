@@ -11,10 +11,18 @@ export const fetchProblems = () => http.get('/api/problems').then((res) => res.d
 export const searchAlgorithms = (params = {}) =>
   http.get('/api/algorithms', { params }).then((res) => res.data);
 
+// 搜索框联想：仅返回 {type, id, name}，适合逐键调用
+export const fetchSuggestions = (q, params = {}) =>
+  http.get('/api/suggest', { params: { q, ...params } }).then((res) => res.data);
+
 // 获取算法详情
 export const getAlgorithmDetail = (id) =>
   http.get(`/api/algorithms/${id}`).then((res) => res.data);
 
+// 批量获取算法/工具及关联实体，替代逐个请求详情
+// payload 示例：{ algorithms: [1, 2], tools: [5], include: ['tools', 'papers', 'labs', 'problems'] }
+export const fetchBatch = (payload) => http.post('/api/batch', payload).then((res) => res.data);
+
 // 登录，返回 token 等信息
 export const login = (payload) => http.post('/api/auth/login', payload).then((res) => res.data);
 
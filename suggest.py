@@ -0,0 +1,396 @@
+"""搜索框联想索引：基于有序前缀表与三元组（trigram）倒排的内存索引（中文注释版）。
+
+索引覆盖问题、算法、工具、实验室四类实体的名称，只保存 (type, id, name)，
+查询不访问数据库。写操作提交后由 SQLAlchemy 会话事件增量更新索引，并递增 cache_version 表中的版本号；
+多进程部署下各 worker 各自持有索引，每 SUGGEST_VERSION_CHECK_SECONDS 检查一次版本号，
+其他 worker 或任务调度进程（批量修改、级联删除）提交的名称修改据此触发重建；
+另按 SUGGEST_REFRESH_SECONDS 定期全量重建兜底。
+全量重建在锁外构建新结构后整体替换，同一时刻只有一个线程重建，其余线程继续使用旧索引。
+"""
+
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models import Algorithm, CacheVersion, Lab, Problem, Tool, db
+
+logger = logging.getLogger(__name__)
+
+# 实体类型与模型的对应关系，顺序即同分时的展示优先级
+SUGGEST_MODELS = (
+    ("problem", Problem),
+    ("algorithm", Algorithm),
+    ("tool", Tool),
+    ("lab", Lab),
+)
+_TYPE_BY_MODEL = {model: entity_type for entity_type, model in SUGGEST_MODELS}
+_TYPE_RANK = {entity_type: rank for rank, (entity_type, _) in enumerate(SUGGEST_MODELS)}
+# cache_version 表中本索引的版本号名称
+VERSION_NAME = "suggest"
+
+# 单词边界：名称中每个单词的起点都登记到前缀表，使 "waterman" 能命中 "Smith-Waterman"
+_WORD_START = re.compile(r"(?<![0-9a-z])[0-9a-z]")
+_SPACES = re.compile(r"\s+")
+
+# 模糊匹配阈值：trigram Dice 系数下限，以及前缀编辑距离上限
+MIN_TRIGRAM_SCORE = 0.3
+MAX_EDIT_DISTANCE = 2
+# 少于该长度的查询只做前缀匹配，容错对一两个字符没有意义
+MIN_FUZZY_LENGTH = 3
+# 查询开销上限：前缀表最多扫描 limit 的倍数条；模糊匹配只对 trigram 重合最多的若干候选计算编辑距离
+PREFIX_SCAN_FACTOR = 8
+FUZZY_CANDIDATE_FACTOR = 3
+
+
+def normalize(text: str) -> str:
+    """统一小写并压缩空白，作为索引与查询的共同形式。"""
+
+    return _SPACES.sub(" ", (text or "").strip().lower())
+
+
+def trigrams(text: str) -> set:
+    """生成带边界填充的三元组集合，短词也能产生可比较的特征。"""
+
+    padded = f"$${text}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def prefix_edit_distance(query: str, text: str, limit: int) -> int:
+    """query 与 text 任一前缀之间的最小编辑距离（OSA，含相邻换位）；超过 limit 时返回 limit + 1。
+
+    一次动态规划即可得到与所有前缀的距离；只计算 |i - j| <= limit 的对角带，带外视为超限。
+    """
+
+    text = text[: len(query) + limit]
+    over = limit + 1
+    prev2 = None
+    prev = [j if j <= limit else over for j in range(len(text) + 1)]
+    for i in range(1, len(query) + 1):
+        cur = [over] * (len(text) + 1)
+        if i <= limit:
+            cur[0] = i
+        a = query[i - 1]
+        for j in range(max(1, i - limit), min(len(text), i + limit) + 1):
+            b = text[j - 1]
+            value = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (a != b))
+            if prev2 is not None and j > 1 and a == text[j - 2] and query[i - 2] == b:
+                value = min(value, prev2[j - 2] + 1)
+            cur[j] = value
+        if min(cur) > limit:
+            return over
+        prev2, prev = prev, cur
+    best = min(prev[max(0, len(query) - limit) :], default=over)
+    return best if best <= limit else over
+
+
+def _build(rows):
+    """由 (type, id, name) 序列构建 (entries, prefixes, grams)；前缀表收集完后一次排序。"""
+
+    entries, prefixes, grams = {}, [], {}
+    for entity_type, entity_id, name in rows:
+        norm = normalize(name)
+        if not norm:
+            continue
+        key = (entity_type, entity_id)
+        if key in entries:
+            continue
+        gram_set = trigrams(norm)
+        entries[key] = (name, norm, len(gram_set))
+        prefixes.extend((norm[match.start() :],) + key for match in _WORD_START.finditer(norm))
+        for gram in gram_set:
+            grams.setdefault(gram, set()).add(key)
+    prefixes.sort()
+    return entries, prefixes, grams
+
+
+class SuggestIndex:
+    """名称联想索引：前缀表负责精确前缀命中，trigram 倒排负责容错匹配。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key 为 (type, id)，值为 (原始名称, 规范化名称, trigram 数)
+        self._entries = {}
+        # 有序列表，元素为 (名称从某单词起点开始的后缀, type, id)
+        self._prefixes = []
+        # trigram -> {key}
+        self._grams = {}
+        # 重建期间提交的增量修改，替换前在新结构上重放；None 表示未在重建
+        self._journal = None
+        self.built_at = None
+        # 构建时读取的跨进程版本号，以及最近一次检查版本号的时间
+        self.version = None
+        self.checked_at = 0.0
+
+    # ---------- 写入 ----------
+
+    def rebuild(self, rows, version: int = None) -> None:
+        """用 (type, id, name) 序列全量重建索引；version 为读取 rows 之前的跨进程版本号。
+
+        rows 可以是惰性查询：开始记录增量修改后才读取，读取与构建都在锁外进行，
+        期间查询继续使用旧结构；构建完成后重放这段时间的修改并整体替换。
+        """
+
+        with self._lock:
+            self._journal = []
+        try:
+            entries, prefixes, grams = _build(rows)
+        except BaseException:
+            with self._lock:
+                self._journal = None
+            raise
+        with self._lock:
+            journal, self._journal = self._journal, None
+            self._entries, self._prefixes, self._grams = entries, prefixes, grams
+            for key, name in journal:
+                self._remove(key)
+                if name is not None:
+                    self._add(key, name)
+            self.built_at = time.monotonic()
+            self.version = version
+
+    def upsert(self, entity_type: str, entity_id: int, name: str) -> None:
+        """新增或更新单个实体名称。"""
+
+        with self._lock:
+            key = (entity_type, entity_id)
+            self._remove(key)
+            self._add(key, name)
+            if self._journal is not None:
+                self._journal.append((key, name))
+
+    def remove(self, entity_type: str, entity_id: int) -> None:
+        """从索引中删除单个实体。"""
+
+        with self._lock:
+            key = (entity_type, entity_id)
+            self._remove(key)
+            if self._journal is not None:
+                self._journal.append((key, None))
+
+    def adopt_version(self, version: int) -> None:
+        """本进程的修改已增量写入索引：版本号恰好前进一步时直接采用，否则留待下次检查时重建。"""
+
+        with self._lock:
+            if self.version is not None and version == self.version + 1:
+                self.version = version
+
+    def is_stale(self, max_age_seconds) -> bool:
+        """尚未构建，或距上次全量重建超过 max_age_seconds（0/None 表示不定期重建）。"""
+
+        built_at = self.built_at
+        return built_at is None or bool(max_age_seconds and time.monotonic() - built_at > max_age_seconds)
+
+    def _add(self, key, name) -> None:
+        norm = normalize(name)
+        if not norm:
+            return
+        grams = trigrams(norm)
+        self._entries[key] = (name, norm, len(grams))
+        for match in _WORD_START.finditer(norm):
+            insort(self._prefixes, (norm[match.start() :],) + key)
+        for gram in grams:
+            self._grams.setdefault(gram, set()).add(key)
+
+    def _remove(self, key) -> None:
+        entry = self._entries.pop(key, None)
+        if not entry:
+            return
+        norm = entry[1]
+        for match in _WORD_START.finditer(norm):
+            item = (norm[match.start() :],) + key
+            pos = bisect_left(self._prefixes, item)
+            if pos < len(self._prefixes) and self._prefixes[pos] == item:
+                del self._prefixes[pos]
+        for gram in trigrams(norm):
+            keys = self._grams.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._grams[gram]
+
+    # ---------- 查询 ----------
+
+    def search(self, query: str, limit: int = 10, types=None) -> list:
+        """返回按相关度排序的 [{type, id, name}]，最多 limit 条。"""
+
+        q = normalize(query)
+        if not q or limit <= 0:
+            return []
+
+        with self._lock:
+            # 分数越小越靠前：(档位, 次级分, 名称长度)
+            scored = {}
+
+            def offer(key, rank):
+                if types and key[0] not in types:
+                    return
+                if key not in scored or rank < scored[key]:
+                    scored[key] = rank
+
+            # 1) 前缀命中：整名前缀优于单词前缀；收集到 limit 条整名命中或达到扫描上限即停止
+            pos = bisect_left(self._prefixes, (q,))
+            end = min(len(self._prefixes), pos + limit * PREFIX_SCAN_FACTOR)
+            first_tier = 0
+            while pos < end and first_tier < limit:
+                suffix, entity_type, entity_id = self._prefixes[pos]
+                if not suffix.startswith(q):
+                    break
+                key = (entity_type, entity_id)
+                norm = self._entries[key][1]
+                if suffix == norm and (not types or entity_type in types):
+                    first_tier += 1
+                offer(key, (0 if suffix == norm else 1, 0.0, len(norm)))
+                pos += 1
+
+            # 2) 容错匹配：trigram 召回候选，先用重合数粗筛，再对少量候选计算前缀编辑距离
+            if len(scored) < limit and len(q) >= MIN_FUZZY_LENGTH:
+                q_grams = trigrams(q)
+                q_count = len(q_grams)
+                overlap = Counter()
+                for gram in q_grams:
+                    overlap.update(self._grams.get(gram, ()))
+                max_dist = min(MAX_EDIT_DISTANCE, max(len(q) // 4, 1))
+                # 每处编辑最多破坏 3 个 trigram，末尾的 "x$" 与名称前缀也不重合
+                min_common = max(1, q_count - 1 - 3 * max_dist)
+                # 候选按重合数降序，拼写近似的命中凑满 limit 条后即可停止
+                close = sum(1 for rank in scored.values() if rank[0] < 3)
+                for key, common in overlap.most_common(limit * FUZZY_CANDIDATE_FACTOR):
+                    if close >= limit:
+                        break
+                    if key in scored:
+                        continue
+                    _, norm, gram_count = self._entries[key]
+                    dice = 2.0 * common / (q_count + gram_count)
+                    dist = prefix_edit_distance(q, norm, max_dist) if common >= min_common else max_dist + 1
+                    if dist <= max_dist:
+                        offer(key, (2, dist - dice, len(norm)))
+                        close += key in scored
+                    elif dice >= MIN_TRIGRAM_SCORE:
+                        offer(key, (3, -dice, len(norm)))
+
+            ranked = sorted(scored.items(), key=lambda kv: (kv[1], _TYPE_RANK.get(kv[0][0], 99), kv[0][1]))
+            return [
+                {"type": entity_type, "id": entity_id, "name": self._entries[(entity_type, entity_id)][0]}
+                for (entity_type, entity_id), _ in ranked[:limit]
+            ]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 进程内单例；_refresh_lock 保证同一时刻只有一个线程执行全量重建
+suggest_index = SuggestIndex()
+_refresh_lock = threading.Lock()
+
+
+def load_rows():
+    """只查询 id 与 name 两列，避免加载完整实体与关联。"""
+
+    for entity_type, model in SUGGEST_MODELS:
+        for entity_id, name in db.session.query(model.id, model.name):
+            yield entity_type, entity_id, name
+
+
+def current_version() -> int:
+    """读取跨进程版本号；尚无记录视为 0。"""
+
+    version = db.session.execute(select(CacheVersion.version).where(CacheVersion.name == VERSION_NAME)).scalar()
+    return version or 0
+
+
+def bump_version() -> int:
+    """在独立事务中递增版本号并返回新值，通知其他进程重建索引。"""
+
+    table = CacheVersion.__table__
+    with db.engine.begin() as conn:
+        changed = conn.execute(
+            update(table).where(table.c.name == VERSION_NAME).values(version=table.c.version + 1)
+        ).rowcount
+        if not changed:
+            conn.execute(insert(table).values(name=VERSION_NAME, version=1))
+        return conn.execute(select(table.c.version).where(table.c.name == VERSION_NAME)).scalar()
+
+
+def ensure_fresh(max_age_seconds, check_seconds=None) -> SuggestIndex:
+    """首次使用、超过刷新间隔或跨进程版本号变化时全量重建。
+
+    max_age_seconds 为 0/None 表示不定期重建；check_seconds 为检查版本号的最小间隔，0/None 表示不检查。
+    首次构建时其他线程等待构建完成；之后由抢到锁的线程检查与重建，其余线程直接使用旧索引。
+    """
+
+    index = suggest_index
+    check_due = bool(check_seconds and time.monotonic() - index.checked_at > check_seconds)
+    if not check_due and not index.is_stale(max_age_seconds):
+        return index
+    if not _refresh_lock.acquire(blocking=index.built_at is None):
+        return index
+    try:
+        # 等锁期间可能已由其他线程完成检查或重建
+        check_due = bool(check_seconds and time.monotonic() - index.checked_at > check_seconds)
+        if check_due or index.is_stale(max_age_seconds):
+            version = current_version()
+            index.checked_at = time.monotonic()
+            if index.is_stale(max_age_seconds) or version != index.version:
+                index.rebuild(load_rows(), version)
+    finally:
+        _refresh_lock.release()
+    return index
+
+
+# ---------- 写操作后的增量更新 ----------
+
+_PENDING_KEY = "suggest_pending"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, _flush_context):
+    """flush 后记录名称变更；此时主键已分配、属性仍可读取。"""
+
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for obj in list(session.new) + list(session.dirty):
+        entity_type = _TYPE_BY_MODEL.get(type(obj))
+        if entity_type and obj.id is not None:
+            pending[(entity_type, obj.id)] = obj.name
+    for obj in session.deleted:
+        entity_type = _TYPE_BY_MODEL.get(type(obj))
+        if entity_type and obj.id is not None:
+            pending[(entity_type, obj.id)] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session):
+    """事务提交成功后再写入索引并递增版本号，回滚的修改不会泄漏到联想结果。
+
+    本进程未构建索引时（如任务调度进程）只递增版本号，由各 web worker 检查后重建。
+    """
+
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    try:
+        version = bump_version()
+    except SQLAlchemyError:
+        # 修改已提交，通知失败只会推迟其他进程的更新，由定期全量重建兜底
+        logger.warning("递增联想索引版本号失败", exc_info=True)
+        version = None
+    if suggest_index.built_at is None:
+        return
+    for (entity_type, entity_id), name in pending.items():
+        if name is None:
+            suggest_index.remove(entity_type, entity_id)
+        else:
+            suggest_index.upsert(entity_type, entity_id, name)
+    if version is not None:
+        suggest_index.adopt_version(version)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(session, _previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
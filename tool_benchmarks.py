@@ -0,0 +1,228 @@
+"""工具基准记录的列式缓存与聚合计算（中文注释版）。
+
+每个数据集的基准记录按列载入为 NumPy 数组并缓存，聚合查询（中位数、Pareto 前沿）
+在数组上向量化完成，不逐行构造 ORM 对象。记录只追加不修改，缓存以
+(记录数, 最大 id) 作为版本号，写入后任一 worker 下次查询都会发现版本变化并重新载入。
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from sqlalchemy import insert, select
+
+from models import BenchmarkRun, db
+
+# 列式缓存中的数值列；accuracy 等可空列以 NaN 表示缺失
+NUMERIC_COLUMNS = ("read_count", "wall_time_seconds", "peak_memory_mb", "accuracy", "precision", "recall")
+REQUIRED_COLUMNS = ("wall_time_seconds", "peak_memory_mb")
+# 取值须在 0~1 之间的比例类指标
+RATIO_COLUMNS = ("accuracy", "precision", "recall")
+# 整数列（BIGINT），其余数值列为 FLOAT
+INTEGER_COLUMNS = ("read_count",)
+# 与 benchmark_run.dataset 的 VARCHAR(255) 一致
+DATASET_MAX_LENGTH = 255
+# 列类型的取值上限：BIGINT 与 MySQL 单精度 FLOAT
+BIGINT_MAX = 2**63 - 1
+FLOAT_MAX = 3.4e38
+
+
+class DatasetColumns:
+    """单个数据集的列式数据：tool_id 为 int64，其余为 float64。"""
+
+    def __init__(self, version, tool_id, columns):
+        self.version = version
+        self.tool_id = tool_id
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.tool_id)
+
+
+class ColumnCache:
+    """按数据集缓存 DatasetColumns 的线程安全 LRU。"""
+
+    def __init__(self, max_datasets: int = 32):
+        self.max_datasets = max_datasets
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, dataset: str) -> DatasetColumns:
+        version = _dataset_version(dataset)
+        with self._lock:
+            cached = self._data.get(dataset)
+            if cached is not None and cached.version == version:
+                self._data.move_to_end(dataset)
+                return cached
+        loaded = _load_columns(dataset, version)
+        with self._lock:
+            self._data[dataset] = loaded
+            self._data.move_to_end(dataset)
+            while len(self._data) > self.max_datasets:
+                self._data.popitem(last=False)
+        return loaded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+column_cache = ColumnCache()
+
+
+def _dataset_version(dataset: str):
+    """廉价的版本号查询，走 (dataset, tool_id) 索引。"""
+
+    return db.session.execute(
+        select(db.func.count(BenchmarkRun.id), db.func.max(BenchmarkRun.id)).where(BenchmarkRun.dataset == dataset)
+    ).one()
+
+
+def _load_columns(dataset: str, version) -> DatasetColumns:
+    table = BenchmarkRun.__table__
+    rows = db.session.execute(
+        select(table.c.tool_id, *[table.c[name] for name in NUMERIC_COLUMNS]).where(table.c.dataset == dataset)
+    ).all()
+    if not rows:
+        empty = np.empty(0, dtype=np.float64)
+        return DatasetColumns(version, np.empty(0, dtype=np.int64), {name: empty for name in NUMERIC_COLUMNS})
+
+    transposed = list(zip(*rows))
+    tool_id = np.asarray(transposed[0], dtype=np.int64)
+    # None 在 float64 数组中转为 NaN
+    columns = {name: np.asarray(values, dtype=np.float64) for name, values in zip(NUMERIC_COLUMNS, transposed[1:])}
+    return DatasetColumns(version, tool_id, columns)
+
+
+# ---------- 写入 ----------
+
+
+def is_id(value) -> bool:
+    """BIGINT 范围内的正整数 id（排除 bool）。"""
+
+    return isinstance(value, int) and not isinstance(value, bool) and 0 < value <= BIGINT_MAX
+
+
+def _check_number(name: str, value):
+    """校验单个数值字段，返回错误信息；合法时返回 None。"""
+
+    if name in INTEGER_COLUMNS:
+        if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= BIGINT_MAX:
+            return f"{name} 需为 0~{BIGINT_MAX} 之间的整数"
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return f"{name} 需为数值"
+    # 链式比较不做 float 转换，超大整数不会溢出；get_json() 接受的 NaN/Infinity 也在此排除
+    if not 0 <= value <= FLOAT_MAX:
+        return f"{name} 需为 0~{FLOAT_MAX:g} 之间的有限数"
+    if name in RATIO_COLUMNS and value > 1:
+        return f"{name} 需在 0~1 之间"
+    return None
+
+
+def validate_runs(runs, known_tool_ids) -> list:
+    """校验待写入记录，返回 [(下标, 错误信息)]；为空表示全部合法。"""
+
+    errors = []
+    for i, run in enumerate(runs):
+        if not isinstance(run, dict):
+            errors.append((i, "记录需为对象"))
+            continue
+        if not is_id(run.get("tool_id")):
+            errors.append((i, "tool_id 需为正整数"))
+        elif run["tool_id"] not in known_tool_ids:
+            errors.append((i, "tool_id 不存在"))
+        dataset = run.get("dataset")
+        if not isinstance(dataset, str) or not dataset.strip():
+            errors.append((i, "dataset 为必填"))
+        elif len(dataset.strip()) > DATASET_MAX_LENGTH:
+            errors.append((i, f"dataset 长度不能超过 {DATASET_MAX_LENGTH}"))
+        for name in NUMERIC_COLUMNS:
+            value = run.get(name)
+            if value is None:
+                if name in REQUIRED_COLUMNS:
+                    errors.append((i, f"{name} 为必填"))
+                continue
+            message = _check_number(name, value)
+            if message:
+                errors.append((i, message))
+    return errors
+
+
+def insert_runs(runs, chunk_size: int = 1000) -> int:
+    """按块 executemany 批量写入，不逐条构造 ORM 对象。"""
+
+    rows = [
+        {"tool_id": run["tool_id"], "dataset": run["dataset"].strip(), **{n: run.get(n) for n in NUMERIC_COLUMNS}}
+        for run in runs
+    ]
+    for start in range(0, len(rows), chunk_size):
+        db.session.execute(insert(BenchmarkRun.__table__), rows[start : start + chunk_size])
+    db.session.commit()
+    return len(rows)
+
+
+# ---------- 聚合 ----------
+
+
+def grouped_median(keys, values):
+    """按 keys 分组求 values 的中位数（忽略 NaN），返回 (分组键, 中位数, 样本数)。"""
+
+    mask = ~np.isnan(values)
+    keys, values = keys[mask], values[mask]
+    if not len(keys):
+        return keys, values, np.empty(0, dtype=np.int64)
+    # 先按键、再按值排序，每组的中位数即组内中间位置
+    order = np.lexsort((values, keys))
+    keys, values = keys[order], values[order]
+    unique, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+    lower = values[starts + (counts - 1) // 2]
+    upper = values[starts + counts // 2]
+    return unique, (lower + upper) / 2.0, counts
+
+
+def _select(data: DatasetColumns, tool_ids=None):
+    if tool_ids is None:
+        return data.tool_id, data.columns
+    mask = np.isin(data.tool_id, np.fromiter(tool_ids, dtype=np.int64))
+    return data.tool_id[mask], {name: col[mask] for name, col in data.columns.items()}
+
+
+def summarize(dataset: str, tool_ids=None) -> list:
+    """每个工具在数据集上的运行次数与各指标中位数。"""
+
+    keys, columns = _select(column_cache.get(dataset), tool_ids)
+    unique, runs = np.unique(keys, return_counts=True)
+    summary = {
+        int(tid): {"tool_id": int(tid), "runs": int(n), **{f"median_{name}": None for name in NUMERIC_COLUMNS}}
+        for tid, n in zip(unique, runs)
+    }
+    for name in NUMERIC_COLUMNS:
+        groups, medians, _ = grouped_median(keys, columns[name])
+        for tid, median in zip(groups, medians):
+            summary[int(tid)][f"median_{name}"] = float(median)
+    return list(summary.values())
+
+
+def pareto_front(dataset: str, tool_ids=None) -> list:
+    """以各工具的中位准确率（越高越好）与中位峰值内存（越低越好）求 Pareto 前沿。"""
+
+    keys, columns = _select(column_cache.get(dataset), tool_ids)
+    acc_tools, accuracy, _ = grouped_median(keys, columns["accuracy"])
+    mem_tools, memory, _ = grouped_median(keys, columns["peak_memory_mb"])
+
+    # 只保留两项指标都有的工具
+    common, acc_idx, mem_idx = np.intersect1d(acc_tools, mem_tools, return_indices=True)
+    accuracy, memory = accuracy[acc_idx], memory[mem_idx]
+    if not len(common):
+        return []
+
+    # 按内存升序（同内存时准确率降序）扫描，准确率严格超过此前最大值的点不被支配
+    order = np.lexsort((-accuracy, memory))
+    acc_sorted = accuracy[order]
+    best_before = np.concatenate(([-np.inf], np.maximum.accumulate(acc_sorted)[:-1]))
+    front = order[acc_sorted > best_before]
+    return [
+        {"tool_id": int(common[i]), "median_accuracy": float(accuracy[i]), "median_peak_memory_mb": float(memory[i])}
+        for i in front
+    ]
@@ -0,0 +1,178 @@
+"""响应编码协商：MessagePack/CBOR 紧凑格式与 gzip/brotli/zstd 压缩（中文注释版）。
+
+- 序列化格式通过 flask-restful 的 representation 机制按 Accept 头协商，JSON 仍为默认；
+- 压缩在 after_request 中按 Accept-Encoding 选择，压缩结果以“响应体摘要 + 编码”为键缓存，
+  同一份数据只压缩一次，后续请求只需计算摘要即可复用；摘要同时作为 ETag 支持 304。
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+import msgpack
+from flask import make_response, request
+
+# 可选依赖：未安装时对应格式/编码不参与协商
+try:
+    import cbor2
+except ImportError:  # pragma: no cover - 取决于部署环境
+    cbor2 = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+MSGPACK_MIMETYPE = "application/msgpack"
+CBOR_MIMETYPE = "application/cbor"
+
+# 仅对这些类型的响应做压缩（已是压缩格式的二进制不在此列）
+COMPRESSIBLE_MIMETYPES = {"application/json", MSGPACK_MIMETYPE, CBOR_MIMETYPE, "text/plain", "text/html"}
+
+
+def _gzip(body: bytes, level: int) -> bytes:
+    # mtime=0 保证同一输入得到相同输出，便于缓存与比对
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def _brotli(body: bytes, level: int) -> bytes:
+    return brotli.compress(body, quality=level)
+
+
+def _zstd(body: bytes, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=level).compress(body)
+
+
+def available_encodings(config) -> "OrderedDict[str, tuple]":
+    """返回 {编码名: (压缩函数, 压缩级别)}，顺序即客户端同等偏好时的服务端优先级。"""
+
+    encoders = OrderedDict()
+    if zstandard is not None:
+        encoders["zstd"] = (_zstd, config["COMPRESS_ZSTD_LEVEL"])
+    if brotli is not None:
+        encoders["br"] = (_brotli, config["COMPRESS_BROTLI_LEVEL"])
+    encoders["gzip"] = (_gzip, config["COMPRESS_GZIP_LEVEL"])
+    return encoders
+
+
+class CompressedCache:
+    """按 (摘要, 编码) 缓存压缩结果的线程安全 LRU。"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compress(self, digest: str, encoding: str, body: bytes, compress, level: int) -> bytes:
+        key = (digest, encoding)
+        with self._lock:
+            cached = self._data.get(key)
+            if cached is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        # 压缩在锁外进行，避免大响应阻塞其他线程
+        compressed = compress(body, level)
+        with self._lock:
+            self._data[key] = compressed
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+        return compressed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+def register_representations(api) -> None:
+    """为 flask-restful 注册 MessagePack（及可选的 CBOR）输出格式。"""
+
+    @api.representation(MSGPACK_MIMETYPE)
+    def output_msgpack(data, code, headers=None):
+        resp = make_response(msgpack.packb(data, use_bin_type=True), code)
+        resp.headers.extend(headers or {})
+        return resp
+
+    if cbor2 is not None:
+
+        @api.representation(CBOR_MIMETYPE)
+        def output_cbor(data, code, headers=None):
+            resp = make_response(cbor2.dumps(data), code)
+            resp.headers.extend(headers or {})
+            return resp
+
+
+def _choose_encoding(encoders) -> str:
+    """按 Accept-Encoding 的 q 值选择编码；q 相同时按服务端优先级。"""
+
+    accepted = request.accept_encodings
+    best, best_q = None, 0
+    for name in encoders:
+        q = accepted[name]
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def init_compression(app) -> CompressedCache:
+    """挂载 after_request 压缩钩子，返回进程内压缩缓存以便观测与测试。"""
+
+    cache = CompressedCache(app.config["COMPRESS_CACHE_SIZE"])
+    app.extensions["compressed_cache"] = cache
+
+    @app.after_request
+    def compress_response(response):
+        response.vary.add("Accept")
+        response.vary.add("Accept-Encoding")
+
+        if (
+            response.direct_passthrough
+            or response.status_code != 200
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        body = response.get_data()
+        cacheable = request.method in ("GET", "HEAD") and "Authorization" not in request.headers
+        digest = None
+        if cacheable:
+            # 摘要包含 Content-Type，同一数据的 JSON 与 MessagePack 表示互不混淆
+            digest = hashlib.blake2b(response.mimetype.encode() + b"\0" + body, digest_size=16).hexdigest()
+            # 弱 ETag：不同压缩编码的字节不同，但语义上是同一表示
+            response.set_etag(digest, weak=True)
+            if request.if_none_match.contains_weak(digest):
+                response.status_code = 304
+                response.set_data(b"")
+                return response
+
+        if len(body) < app.config["COMPRESS_MIN_SIZE"]:
+            return response
+
+        encoders = available_encodings(app.config)
+        encoding = _choose_encoding(encoders)
+        if encoding is None:
+            return response
+
+        compress, level = encoders[encoding]
+        if cacheable:
+            data = cache.get_or_compress(digest, encoding, body, compress, level)
+        else:
+            data = compress(body, level)
+
+        response.set_data(data)
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    return cache